@@ -1,7 +1,10 @@
 import os
 import argparse
+import io
+import mmap
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from itertools import repeat
 import re
-from pathlib import Path
 import jsmin
 import csscompressor
 import htmlmin
@@ -9,10 +12,93 @@ import json
 from fnmatch import fnmatch
 import pathspec
 
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Patterns used on every minified file, compiled once at import time
+SVELTE_COMMENT_RE = re.compile(r'<!--[\s\S]*?-->')
+SVELTE_SCRIPT_RE = re.compile(r'<script[^>]*>([\s\S]*?)</script>')
+SVELTE_STYLE_RE = re.compile(r'<style[^>]*>([\s\S]*?)</style>')
+WHITESPACE_RE = re.compile(r'\s+')
+TAG_WHITESPACE_RE = re.compile(r'>\s+<')
+LONG_DIGITS_RE = re.compile(r'\d{19}')
+GROUP_NAME_RE = re.compile(r'\(\?P<\w+>')
+
+# Prefix pathspec emits for gitignore patterns that may match at any depth
+FLOATING_PREFIX = '^(?:.+/)?'
+
+# Code block language for each supported extension
+FILE_TYPES = {
+    '.svelte': 'svelte',
+    '.ts': 'typescript',
+    '.js': 'javascript',
+    '.css': 'css',
+    '.scss': 'scss',
+    '.json': 'json',
+    '.md': 'markdown',
+    '.html': 'html'
+}
+
+BINARY_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.ico', '.woff', '.woff2', '.ttf', '.eot'})
+
+# File types handled by a dedicated minifier rather than whitespace collapsing
+MINIFIER_TYPES = frozenset({'javascript', 'typescript', 'css', 'scss', 'html', 'json', 'svelte'})
+
+# Inputs shorter than this are only stripped instead of being minified
+MIN_MINIFY_LENGTH = 64
+
+PREMINIFIED_SUFFIXES = ('.min.js', '.min.css')
+
+# Files above this size are memory-mapped instead of read into a buffer
+MMAP_THRESHOLD = 1 << 20
+
+# Directory names pruned before any other check during the walk
+SKIP_DIRS = frozenset({
+    'node_modules',
+    '.git',
+    '.svelte-kit',
+    'build',
+    '__pycache__',
+    '.DS_Store'
+})
+
+# Path fragments that are always skipped, on top of user-supplied excludes
+DEFAULT_SKIP_PATTERNS = [
+    'node_modules',
+    '.git',
+    '.svelte-kit',
+    'build',
+    '__pycache__',
+    '.DS_Store',
+    '.env',
+    'package-lock.json',
+    'package.json',
+    'yarn.lock'
+]
+
 class GitignoreFilter:
     def __init__(self, root_dir):
         self.root_dir = root_dir
         self.spec = self._load_gitignore()
+        self._anchored, self._floating, self._other, self._has_negations = self._compile_patterns()
+        self._hs_patterns, self._hs_db = self._compile_hyperscan()
 
     def _load_gitignore(self):
         gitignore_path = os.path.join(self.root_dir, '.gitignore')
@@ -27,34 +113,146 @@ class GitignoreFilter:
             print(f"Warning: Error reading .gitignore file: {str(e)}")
             return pathspec.PathSpec([])
 
-    def is_ignored(self, path):
-        # Convert absolute path to relative path from root
-        rel_path = os.path.relpath(path, self.root_dir)
-        return self.spec.match_file(rel_path)
+    def _compile_patterns(self):
+        # Fuse every pattern into a few alternations so a path is tested in
+        # at most three regex calls. Patterns rooted at the top level are matched
+        # with fullmatch, while those pathspec prefixes with (?:.+/)? to match
+        # at any depth are searched for after a slash instead, so the engine
+        # never backtracks through a leading .+ for every path. Named groups
+        # are stripped since pathspec reuses the same name in every pattern.
+        patterns = [p for p in self.spec.patterns if p.include is not None]
+        anchored = []
+        floating = []
+        # Any other shape is searched unchanged so its own anchors still apply
+        other = []
+        for pattern in patterns:
+            if not pattern.include:
+                continue
+            regex = GROUP_NAME_RE.sub('(?:', pattern.regex.pattern)
+            if regex.startswith(FLOATING_PREFIX) and regex.endswith('$'):
+                floating.append(f"(?:{regex[len(FLOATING_PREFIX):-1]})")
+            elif regex.startswith('^') and regex.endswith('$'):
+                anchored.append(f"(?:{regex[1:-1]})")
+            else:
+                other.append(f"(?:{regex})")
+        
+        anchored_re = re.compile('|'.join(anchored), re.DOTALL) if anchored else None
+        floating_re = re.compile(f"(?:^|/)(?:{'|'.join(floating)})\\Z", re.DOTALL) if floating else None
+        other_re = re.compile('|'.join(other), re.DOTALL) if other else None
+        has_negations = any(not p.include for p in patterns)
+        return anchored_re, floating_re, other_re, has_negations
+
+    def _compile_hyperscan(self):
+        # Hyperscan compiles all patterns into one automaton that reports
+        # every matching pattern id in a single scan. Without it, or if a
+        # pattern is rejected, matching falls back to the combined regex.
+        patterns = [p for p in self.spec.patterns if p.include is not None]
+        if hyperscan is None or not patterns:
+            return None, None
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[GROUP_NAME_RE.sub('(?:', p.regex.pattern).encode('utf-8') for p in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8] * len(patterns),
+            )
+        except Exception as e:
+            print(f"Warning: Hyperscan could not compile .gitignore patterns: {str(e)}")
+            return None, None
+        return patterns, db
+
+    @staticmethod
+    def _on_hs_match(pattern_id, start, end, flags, matches):
+        matches.append(pattern_id)
+
+    def match_file_rel(self, rel_path):
+        # Callers that already know the path relative to root skip relpath
+        return self._match(pathspec.util.normalize_file(rel_path))
+
+    def _match(self, rel_path):
+        if self._hs_db is not None:
+            matches = []
+            self._hs_db.scan(rel_path.encode('utf-8'), match_event_handler=self._on_hs_match, context=matches)
+            # Ids follow file order, so the highest one is the last match
+            return bool(matches) and self._hs_patterns[max(matches)].include
+        # Try the cheap anchored match first, the searches only if needed
+        if not ((self._anchored is not None and self._anchored.fullmatch(rel_path))
+                or (self._floating is not None and self._floating.search(rel_path))
+                or (self._other is not None and self._other.search(rel_path))):
+            return False
+        if not self._has_negations:
+            return True
+        # Negations can re-include a path, so the last matching pattern wins
+        for pattern in reversed(self.spec.patterns):
+            if pattern.include is not None and pattern.regex.search(rel_path):
+                return pattern.include
+        return False
 
-def minify_content(content: str, file_type: str) -> str:
+def minify_js(content: str) -> str:
+    """
+    Minify JavaScript using rjsmin's C implementation, falling back to jsmin.
+    """
+    if rjsmin is not None:
+        try:
+            return rjsmin.jsmin(content, keep_bang_comments=False)
+        except Exception:
+            pass
+    return jsmin.jsmin(content)
+
+def minify_css(content: str) -> str:
+    """
+    Minify CSS using rcssmin's C implementation, falling back to csscompressor.
+    """
+    if rcssmin is not None:
+        try:
+            return rcssmin.cssmin(content, keep_bang_comments=False)
+        except Exception:
+            pass
+    return csscompressor.compress(content)
+
+def minify_json(content: str) -> str:
+    """
+    Minify JSON using orjson's C implementation, falling back to the json module.
+    """
+    # orjson parses integers beyond 64 bits as floats, so leave those to json
+    if orjson is not None and not LONG_DIGITS_RE.search(content):
+        try:
+            # orjson emits the compact form by default
+            return orjson.dumps(orjson.loads(content)).decode('utf-8')
+        except Exception:
+            pass
+    return json.dumps(json.loads(content), separators=(',', ':'))
+
+def minify_content(content: str, file_type: str, file_path: str = '') -> str:
     """
     Minify content based on file type while preserving code integrity.
     """
+    if file_type in MINIFIER_TYPES:
+        # Minifier overhead outweighs the few bytes saved on tiny or pre-minified input
+        if len(content) < MIN_MINIFY_LENGTH:
+            return content.strip()
+        if file_path.endswith(PREMINIFIED_SUFFIXES):
+            return content
+    
     try:
         if file_type in ['javascript', 'typescript']:
-            return jsmin.jsmin(content)
+            return minify_js(content)
         elif file_type in ['css', 'scss']:
-            return csscompressor.compress(content)
+            return minify_css(content)
         elif file_type == 'html':
             return htmlmin.minify(content, remove_empty_space=True)
         elif file_type == 'json':
-            return json.dumps(json.loads(content), separators=(',', ':'))
+            stripped = content.strip()
+            if not stripped.startswith(('{', '[')):
+                return stripped
+            return minify_json(stripped)
         elif file_type == 'svelte':
-            content = re.sub(r'<!--[\s\S]*?-->', '', content)
-            content = re.sub(r'<script[^>]*>([\s\S]*?)</script>', 
-                           lambda m: f'<script>{jsmin.jsmin(m.group(1))}</script>', 
-                           content)
-            content = re.sub(r'<style[^>]*>([\s\S]*?)</style>', 
-                           lambda m: f'<style>{csscompressor.compress(m.group(1))}</style>', 
-                           content)
-            content = re.sub(r'\s+', ' ', content)
-            content = re.sub(r'>\s+<', '><', content)
+            content = SVELTE_COMMENT_RE.sub('', content)
+            content = SVELTE_SCRIPT_RE.sub(lambda m: f'<script>{minify_js(m.group(1))}</script>', content)
+            content = SVELTE_STYLE_RE.sub(lambda m: f'<style>{minify_css(m.group(1))}</style>', content)
+            content = WHITESPACE_RE.sub(' ', content)
+            content = TAG_WHITESPACE_RE.sub('><', content)
             return content.strip()
         else:
             return ' '.join(content.split())
@@ -62,95 +260,164 @@ def minify_content(content: str, file_type: str) -> str:
         print(f"Warning: Minification failed for {file_type}, using original content: {str(e)}")
         return content
 
-def should_include_file(file_path: str, exclude_patterns: list, gitignore_filter: GitignoreFilter) -> bool:
+def compile_skip_patterns(exclude_patterns: list) -> re.Pattern:
     """
-    Determine if a file should be included based on exclusion patterns,
-    .gitignore rules, and file types we want to skip.
+    Build a single regex matching any default or user-supplied skip pattern.
     """
-    # Check if file is ignored by .gitignore
-    if gitignore_filter.is_ignored(file_path):
-        return False
-    
-    # Check common skip patterns and explicitly excluded files
-    skip_patterns = [
-        'node_modules',
-        '.git',
-        '.svelte-kit',
-        'build',
-        '__pycache__',
-        '.DS_Store',
-        '.env',
-        'package-lock.json',
-        'package.json',
-        'yarn.lock'
-    ] + exclude_patterns
-    
-    # Check for .DS_Store files with any path
-    if '.DS_Store' in file_path:
-        return False
-        
-    # Check if the path contains node_modules anywhere
-    if 'node_modules' in file_path:
-        return False
-    
-    for pattern in skip_patterns:
-        if pattern in file_path:
-            return False
-    
-    # Skip binary files
-    binary_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.ico', '.woff', '.woff2', '.ttf', '.eot'}
-    return Path(file_path).suffix.lower() not in binary_extensions
+    return re.compile('|'.join(map(re.escape, DEFAULT_SKIP_PATTERNS + exclude_patterns)))
 
-def get_file_type(file_path: str) -> str:
+def file_extension(file_path: str) -> str:
     """
-    Determine the file type based on extension for proper formatting.
+    Return the lowercased extension of a path, matching Path.suffix
+    without building a Path object.
     """
-    ext = Path(file_path).suffix.lower()
-    
-    file_types = {
-        '.svelte': 'svelte',
-        '.ts': 'typescript',
-        '.js': 'javascript',
-        '.css': 'css',
-        '.scss': 'scss',
-        '.json': 'json',
-        '.md': 'markdown',
-        '.html': 'html'
-    }
-    
-    return file_types.get(ext, 'text')
+    name_start = max(file_path.rfind('/'), file_path.rfind(os.sep)) + 1
+    i = file_path.rfind('.')
+    if i <= name_start or i == len(file_path) - 1:
+        return ''
+    return file_path[i:].lower()
+
+def dir_allowed(name: str, exclude_re: re.Pattern = None) -> bool:
+    """
+    Determine if a directory should be walked based on its name alone.
+    """
+    return name not in SKIP_DIRS and (exclude_re is None or not exclude_re.search(name))
+
+def file_allowed(rel_path: str, ext: str, skip_re: re.Pattern, gitignore_filter: GitignoreFilter) -> bool:
+    """
+    Determine if a file inside an allowed directory should be included,
+    given its path relative to the project root and its extension.
+    """
+    # Skip binary files, then skip patterns, then .gitignore as the most expensive
+    return (ext not in BINARY_EXTENSIONS
+            and not skip_re.search(rel_path)
+            and not gitignore_filter.match_file_rel(rel_path))
+
+def classify_file(file_path: str, rel_path: str, skip_re: re.Pattern, gitignore_filter: GitignoreFilter) -> tuple:
+    """
+    Determine whether a file should be included and its file type,
+    sharing a single extension lookup between both checks. rel_path is
+    the path relative to the project root.
+    """
+    ext = file_extension(file_path)
+    return file_allowed(rel_path, ext, skip_re, gitignore_filter), FILE_TYPES.get(ext, 'text')
 
-def calculate_size_reduction(original: str, minified: str) -> tuple:
+def calculate_size_reduction(original: str, minified: str, original_size: int = None, minified_size: int = None) -> tuple:
     """
     Calculate the size reduction achieved through minification.
+    Byte sizes that are already known can be passed in to skip re-encoding.
     """
-    original_size = len(original.encode('utf-8'))
-    minified_size = len(minified.encode('utf-8'))
+    if original_size is None:
+        original_size = len(original.encode('utf-8'))
+    if minified_size is None:
+        minified_size = len(minified.encode('utf-8'))
     reduction = ((original_size - minified_size) / original_size) * 100
     return original_size, minified_size, reduction
 
-def format_file_content(file_path: str, content: str, file_type: str, minify: bool) -> str:
+def format_file_content(file_path: str, content: str, file_type: str, minify: bool, original_size: int = None, relative_path: str = None) -> tuple:
     """
     Format the file content with appropriate tags and code blocks.
+    Returns the formatted content with its original and minified sizes
+    (both zero when minification is disabled).
     """
-    relative_path = os.path.relpath(file_path)
-    formatted_content = f"<file path=\"{relative_path}\" type=\"{file_type}\""
+    if relative_path is None:
+        relative_path = os.path.relpath(file_path)
+    orig_size = min_size = 0
+    extra = ''
     
     if minify:
         original_content = content
-        minified_content = minify_content(content, file_type)
-        orig_size, min_size, reduction = calculate_size_reduction(original_content, minified_content)
-        formatted_content += f" original_size=\"{orig_size}\" minified_size=\"{min_size}\" reduction=\"{reduction:.1f}%\""
+        minified_content = minify_content(content, file_type, file_path)
+        orig_size, min_size, reduction = calculate_size_reduction(original_content, minified_content, original_size)
+        extra = f" original_size=\"{orig_size}\" minified_size=\"{min_size}\" reduction=\"{reduction:.1f}%\""
         content = minified_content
     
-    formatted_content += ">\n"
-    formatted_content += "```" + file_type + "\n"
-    formatted_content += content
-    if not content.endswith('\n'):
-        formatted_content += '\n'
-    formatted_content += "```\n"
-    formatted_content += "</file>\n\n"
-    return formatted_content
+    tail = '' if content.endswith('\n') else '\n'
+    return (
+        f"<file path=\"{relative_path}\" type=\"{file_type}\"{extra}>\n"
+        f"```{file_type}\n{content}{tail}```\n</file>\n\n"
+    ), orig_size, min_size
+
+def read_text(file_path: str) -> tuple:
+    """
+    Read a file as UTF-8 with raw os calls, returning the decoded text
+    and its size in bytes. Large files are memory-mapped to avoid a copy.
+    """
+    # O_BINARY stops the Windows CRT from translating CRLF or stopping at Ctrl-Z
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        if size > MMAP_THRESHOLD:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, 'utf-8'), len(mm)
+        # Asking for one byte more than the known size reads the whole file
+        # and detects EOF in a single call
+        raw = os.read(fd, size + 1)
+        if len(raw) > size:
+            # The file grew since fstat, so read the rest in chunks
+            chunks = [raw]
+            while True:
+                data = os.read(fd, 1 << 16)
+                if not data:
+                    break
+                chunks.append(data)
+            raw = b''.join(chunks)
+        return raw.decode('utf-8'), len(raw)
+    finally:
+        os.close(fd)
+
+def read_and_format(file_path: str, relative_path: str, file_type: str, minify: bool):
+    """
+    Read a single file and format it, returning the formatted content along
+    with its original and minified sizes, or None if it cannot be read.
+    """
+    try:
+        content, original_size = read_text(file_path)
+        if '\r' in content:
+            # Match the universal newline handling of text-mode reads. Each
+            # CRLF loses one byte, so the size stays that of the content
+            # being minified and CR removal is not counted as reduction.
+            original_size -= content.count('\r\n')
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return format_file_content(file_path, content, file_type, minify, original_size, relative_path)
+    except UnicodeDecodeError:
+        print(f"Warning: Skipping binary file {file_path}")
+    except Exception as e:
+        print(f"Error processing {file_path}: {str(e)}")
+    return None
+
+def rel_child(rel_root: str, name: str) -> str:
+    """
+    Join a name onto a relative directory path, where '.' is the root.
+    """
+    return name if rel_root == '.' else rel_root + os.sep + name
+
+def walk_directory(directory: str, gitignore_filter: GitignoreFilter, exclude_re: re.Pattern = None, rel_root: str = '.'):
+    """
+    Walk a directory top-down with os.scandir, yielding (root, rel_root, files)
+    where rel_root is root relative to the starting directory.
+    Excluded directories are pruned before their contents are listed.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return
+    
+    dirs = []
+    files = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            # Name checks first so pathspec only runs for surviving directories
+            if (dir_allowed(entry.name, exclude_re)
+                    and not gitignore_filter.match_file_rel(rel_child(rel_root, entry.name))):
+                dirs.append(entry)
+        elif entry.is_file():
+            files.append(entry.name)
+    
+    yield directory, rel_root, files
+    for entry in dirs:
+        yield from walk_directory(entry.path, gitignore_filter, exclude_re, rel_child(rel_root, entry.name))
 
 def process_directory(directory: str, output_file: str, exclude_patterns: list = None, minify: bool = False) -> None:
     """
@@ -162,73 +429,87 @@ def process_directory(directory: str, output_file: str, exclude_patterns: list =
     total_original_size = 0
     total_minified_size = 0
     gitignore_filter = GitignoreFilter(directory)
+    skip_re = compile_skip_patterns(exclude_patterns)
+    exclude_re = re.compile('|'.join(map(re.escape, exclude_patterns))) if exclude_patterns else None
+    # The output file is written after the walk, so a previous run's output
+    # inside the project must not be picked up as a source file
+    output_dir, output_name = os.path.split(os.path.abspath(output_file))
     
     try:
-        with open(output_file, 'w', encoding='utf-8') as out_file:
-            out_file.write("<project>\n\n")
-            
-            # Write project structure
-            out_file.write("<structure>\n")
-            for root, dirs, files in os.walk(directory):
-                # Filter out ignored directories and explicitly excluded ones
-                dirs[:] = [d for d in dirs 
-                          if not gitignore_filter.is_ignored(os.path.join(root, d))
-                          and not any(pattern in d for pattern in exclude_patterns)
-                          and d != 'node_modules'
-                          and '.DS_Store' not in d]
-                
-                level = root.replace(directory, '').count(os.sep)
-                indent = '  ' * level
-                relative_path = os.path.relpath(root, directory)
-                if relative_path != '.':
-                    out_file.write(f"{indent}- {os.path.basename(root)}/\n")
-                
-                for file in sorted(files):
-                    file_path = os.path.join(root, file)
-                    if should_include_file(file_path, exclude_patterns, gitignore_filter):
-                        out_file.write(f"{indent}  - {file}\n")
-            
-            out_file.write("</structure>\n\n")
-            
-            # Write file contents
-            out_file.write("<files>\n")
-            for root, _, files in os.walk(directory):
-                for file in sorted(files):
-                    file_path = os.path.join(root, file)
-                    if should_include_file(file_path, exclude_patterns, gitignore_filter):
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                                file_type = get_file_type(file_path)
-                                
-                                if minify:
-                                    orig_size = len(content.encode('utf-8'))
-                                    total_original_size += orig_size
-                                
-                                formatted_content = format_file_content(file_path, content, file_type, minify)
-                                
-                                if minify:
-                                    min_size = int(re.search(r'minified_size="(\d+)"', formatted_content).group(1))
-                                    total_minified_size += min_size
-                                
-                                out_file.write(formatted_content)
-                        except UnicodeDecodeError:
-                            print(f"Warning: Skipping binary file {file_path}")
-                        except Exception as e:
-                            print(f"Error processing {file_path}: {str(e)}")
-            
-            out_file.write("</files>\n")
-            
-            if minify:
-                total_reduction = ((total_original_size - total_minified_size) / total_original_size) * 100
-                out_file.write(f"\n<statistics>\n")
-                out_file.write(f"Total original size: {total_original_size:,} bytes\n")
-                out_file.write(f"Total minified size: {total_minified_size:,} bytes\n")
-                out_file.write(f"Overall reduction: {total_reduction:.1f}%\n")
-                out_file.write("</statistics>\n")
-            
-            out_file.write("</project>")
+        # The file is only opened at the end, so fail before the walk if it
+        # could not be written then. Opening it now would truncate it.
+        if not os.path.isdir(output_dir):
+            raise FileNotFoundError(f"Output directory does not exist: {output_dir}")
+        output_path = os.path.join(output_dir, output_name)
+        if os.path.isdir(output_path):
+            raise IsADirectoryError(f"Output path is a directory: {output_path}")
+        if not os.access(output_path if os.path.exists(output_path) else output_dir, os.W_OK):
+            raise PermissionError(f"Output file is not writable: {output_path}")
+        
+        # Assemble the whole document in memory so the file is written in one go
+        buf = io.StringIO()
+        buf.write("<project>\n\n")
+        
+        # Walk the tree once, buffering the structure and the files to emit
+        structure_lines = []
+        file_entries = []
+        for root, rel_root, files in walk_directory(directory, gitignore_filter, exclude_re):
+            level = root.replace(directory, '').count(os.sep)
+            indent = '  ' * level
+            if rel_root != '.':
+                structure_lines.append(f"{indent}- {os.path.basename(root)}/\n")
             
+            # Paths shown in the output are relative to the working directory
+            display_root = os.path.relpath(root)
+            is_output_dir = os.path.abspath(root) == output_dir
+            for file in sorted(files):
+                if is_output_dir and file == output_name:
+                    continue
+                file_path = os.path.join(root, file)
+                include, file_type = classify_file(file_path, rel_child(rel_root, file), skip_re, gitignore_filter)
+                if include:
+                    structure_lines.append(f"{indent}  - {file}\n")
+                    file_entries.append((file_path, rel_child(display_root, file), file_type))
+        
+        # Write project structure
+        buf.write(f"<structure>\n{''.join(structure_lines)}</structure>\n\n")
+        
+        # Write file contents
+        buf.write("<files>\n")
+        # Reading is I/O bound and scales with threads, while minification
+        # is CPU bound in the interpreter and needs separate processes
+        if minify:
+            executor = ProcessPoolExecutor()
+        else:
+            executor = ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2)
+        with executor:
+            file_paths, relative_paths, file_types = zip(*file_entries) if file_entries else ((), (), ())
+            results = executor.map(read_and_format, file_paths, relative_paths, file_types, repeat(minify), chunksize=16)
+            for result in results:
+                if result is None:
+                    continue
+                formatted_content, orig_size, min_size = result
+                total_original_size += orig_size
+                total_minified_size += min_size
+                buf.write(formatted_content)
+        
+        buf.write("</files>\n")
+        
+        if minify:
+            total_reduction = ((total_original_size - total_minified_size) / total_original_size) * 100
+            buf.write(
+                f"\n<statistics>\n"
+                f"Total original size: {total_original_size:,} bytes\n"
+                f"Total minified size: {total_minified_size:,} bytes\n"
+                f"Overall reduction: {total_reduction:.1f}%\n"
+                "</statistics>\n"
+            )
+        
+        buf.write("</project>")
+        
+        with open(output_file, 'w', encoding='utf-8') as out_file:
+            out_file.write(buf.getvalue())
+        
     except Exception as e:
         print(f"Error writing to output file: {str(e)}")
         raise